@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 import hashlib
 import os
 import random
-from typing import Dict, List, Literal, Protocol
+import re
+import threading
+from typing import Dict, List, Literal, Protocol, Sequence, Tuple
+import weakref
 
 # Optional .env loader if available
 try:  # pragma: no cover - optional
@@ -16,6 +22,20 @@ except Exception:  # pragma: no cover - optional
 
 from loops import negative_feedback_chain, positive_feedback_chain
 
+_DOTENV_LOADED = False
+
+
+def _ensure_dotenv() -> None:
+    """Load .env at most once, and only when the key is not already exported."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED or load_dotenv is None or os.environ.get("OPENAI_API_KEY"):
+        return
+    _DOTENV_LOADED = True
+    try:
+        load_dotenv()
+    except Exception:
+        pass
+
 
 Stance = Literal["negative", "positive"]
 
@@ -32,113 +52,345 @@ class LLMClient(Protocol):
         ...
 
 
+# Module-level LRU caches may be touched by concurrent agent threads.
+_cache_lock = threading.Lock()
+
+
+def _lru_get(cache: OrderedDict, key):
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _lru_put(cache: OrderedDict, key, value, size: int) -> None:
+    with _cache_lock:
+        cache[key] = value
+        if len(cache) > size:
+            cache.popitem(last=False)
+
+
+# Per-client caches key on id(client), so any client can be cached and none is
+# kept alive by a cache. When a client is collected its finalizer queues the id;
+# entries for queued ids are purged before the next client is registered, so a
+# recycled id never sees a dead client's entries.
+_client_caches: List[OrderedDict] = []
+_live_clients: Dict[int, weakref.finalize] = {}
+_dead_clients: List[int] = []
+
+
+def _client_cache(cache: OrderedDict) -> OrderedDict:
+    """Register a cache whose keys start with a _client_id()."""
+    _client_caches.append(cache)
+    return cache
+
+
+def _client_id(client) -> int | None:
+    """Cache key for client, or None when it cannot be tracked (no weakref support)."""
+    cid = id(client)
+    with _cache_lock:
+        while _dead_clients:
+            dead = _dead_clients.pop()
+            _live_clients.pop(dead, None)
+            for cache in _client_caches:
+                for key in [k for k in cache if k[0] == dead]:
+                    del cache[key]
+        if cid not in _live_clients:
+            try:
+                # The callback only appends (no lock), as it may run mid-GC.
+                fin = weakref.finalize(client, _dead_clients.append, cid)
+            except TypeError:
+                return None
+            fin.atexit = False
+            _live_clients[cid] = fin
+    return cid
+
+
+# Process-wide response cache for live calls, keyed by (model, prompt digest).
+_RESPONSE_CACHE_SIZE = 1024
+_response_cache: OrderedDict[Tuple[str, bytes], str] = OrderedDict()
+
+
+def _prompt_key(model: str, prompt: str) -> Tuple[str, bytes]:
+    return model, hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+
 class OpenAIClient:
     """Placeholder client. Insert provider-specific call in generate().
 
     Reads API key from env (e.g., OPENAI_API_KEY). Does not hardcode provider.
+    With ``cache`` enabled, requests run at temperature 0 and identical prompts
+    are answered from an in-process LRU instead of a new API call.
     """
 
-    def __init__(self) -> None:
+    system_message = (
+        "You are a reflexivity reasoning helper. Return concise, structured content."
+    )
+
+    def __init__(self, cache: bool = True) -> None:
         # Load .env if python-dotenv is available; otherwise rely on process env.
-        if load_dotenv is not None:
-            try:
-                load_dotenv()
-            except Exception:
-                pass
+        _ensure_dotenv()
         self.api_key = os.getenv("OPENAI_API_KEY", "")
+        self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.cache = cache
+        # SDK client is created on first use and reused so its connection pool persists.
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _sdk(self):  # pragma: no cover - network
+        if self._client is None:
+            if not self.api_key:
+                raise RuntimeError("OPENAI_API_KEY not set; cannot run live mode.")
+            # OpenAI v1 SDK style
+            try:
+                from openai import OpenAI  # type: ignore
+            except Exception as exc:  # pragma: no cover - import error
+                raise RuntimeError(
+                    "openai package not installed. Run 'pip install openai'."
+                ) from exc
+            with self._client_lock:
+                if self._client is None:
+                    self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    def _request(self, prompt: str, use_cache: bool) -> Dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_message},
+                {"role": "user", "content": prompt},
+            ],
+            # Only deterministic sampling is worth caching.
+            "temperature": 0.0 if use_cache else 0.2,
+            "max_tokens": 400,
+        }
 
-    def generate(self, prompt: str) -> str:  # pragma: no cover - network
-        if not self.api_key:
-            raise RuntimeError("OPENAI_API_KEY not set; cannot run live mode.")
-        # OpenAI v1 SDK style
-        try:
-            from openai import OpenAI  # type: ignore
-        except Exception as exc:  # pragma: no cover - import error
-            raise RuntimeError(
-                "openai package not installed. Run 'pip install openai'."
-            ) from exc
+    @staticmethod
+    def _text(response) -> str:
+        choice = response.choices[0]
+        return (getattr(choice.message, "content", None) or "").strip()
 
-        client = OpenAI(api_key=self.api_key)
-        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    @staticmethod
+    def _remember(key: Tuple[str, bytes], text: str) -> None:
+        _lru_put(_response_cache, key, text, _RESPONSE_CACHE_SIZE)
 
-        system_message = (
-            "You are a reflexivity reasoning helper. Return concise, structured content."
-        )
+    def _cached(self, prompt: str, use_cache: bool) -> str | None:
+        return _lru_get(_response_cache, _prompt_key(self.model, prompt)) if use_cache else None
+
+    def generate(self, prompt: str, cache: bool | None = None) -> str:  # pragma: no cover - network
+        use_cache = self.cache if cache is None else cache
+        hit = self._cached(prompt, use_cache)
+        if hit is not None:
+            return hit
+        client = self._sdk()
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
-                max_tokens=400,
-            )
+            response = client.chat.completions.create(**self._request(prompt, use_cache))
         except Exception as exc:  # pragma: no cover - network failure
             raise RuntimeError(f"OpenAI request failed: {exc}") from exc
 
-        choice = response.choices[0]
-        text = getattr(choice.message, "content", None) or ""
-        return text.strip()
+        text = self._text(response)
+        if use_cache:
+            self._remember(_prompt_key(self.model, prompt), text)
+        return text
+
+    def generate_many(self, prompts: List[str], cache: bool | None = None) -> List[str]:  # pragma: no cover - network
+        """Send independent prompts concurrently; results keep the input order.
+
+        Each prompt goes through ``generate`` on a small thread pool, so calls share
+        the pooled SDK client and the response cache, and this stays usable from
+        inside a running event loop.
+        """
+        if len(prompts) <= 1:
+            return [self.generate(p, cache) for p in prompts]
+        with ThreadPoolExecutor(max_workers=min(len(prompts), 8)) as pool:
+            return list(pool.map(lambda p: self.generate(p, cache), prompts))
+
+
+_MOCK_SIGNALS = (
+    "auditor turnover",
+    "working-capital strain",
+    "governance flags",
+    "accounting ambiguity",
+    "regulatory chatter",
+)
+
+
+@lru_cache(maxsize=None)
+def _mock_outputs() -> tuple:
+    """Precomputed mock responses, one per 8-bit seed bucket."""
+    return tuple(
+        "Signals: "
+        + ", ".join(random.Random(i).sample(_MOCK_SIGNALS, len(_MOCK_SIGNALS)))
+        + "; Thesis: reflexive dynamics shape price; Drivers: A,B,C; Risks: X,Y,Z;"
+        for i in range(256)
+    )
 
 
 class MockClient:
-    """Deterministic stubbed client for tests and mock mode."""
+    """Deterministic stubbed client for tests and mock mode.
+
+    One byte of a BLAKE2b digest of the prompt selects one of 256 precomputed
+    responses, so identical prompts always yield identical content across runs
+    and platforms.
+    """
 
     def __init__(self, seed: int = 42) -> None:
         self.random = random.Random(seed)
 
     def generate(self, prompt: str) -> str:
         # Produce deterministic pseudo-content based on stable hash.
-        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
-        seed_int = int.from_bytes(digest[:8], "big")
-        self.random.seed(seed_int)
-        base_signal = [
-            "auditor turnover",
-            "working-capital strain",
-            "governance flags",
-            "accounting ambiguity",
-            "regulatory chatter",
-        ]
-        self.random.shuffle(base_signal)
-        # Compact summary-like output
-        return (
-            "Signals: "
-            + ", ".join(base_signal[:5])
-            + "; Thesis: reflexive dynamics shape price; Drivers: A,B,C; Risks: X,Y,Z;"
-        )
+        # The last byte equals int.from_bytes(digest, "big") & 0xFF.
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest()
+        return _mock_outputs()[digest[-1]]
+
+    def generate_many(self, prompts: List[str]) -> List[str]:
+        return [self.generate(p) for p in prompts]
+
+
+# Stance-aware, topic-aware semanticization and overlap guard
+_ENRON_MAP: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "negative": {
+        "drivers": (
+            "auditor churn",
+            "off-balance-sheet obligations",
+            "related-party transactions",
+            "mark-to-market opacity",
+            "credit spread widening",
+            "wholesale funding stress",
+        ),
+        "risks": (
+            "regulatory intervention window",
+            "short-squeeze reflex",
+            "activist balance-sheet clean-up",
+            "acquisition rumor",
+        ),
+    },
+    "positive": {
+        "drivers": (
+            "short-squeeze reflex",
+            "regulatory intervention window",
+            "asset sale / deleveraging",
+            "turnaround guidance",
+            "credit line reaffirmation",
+        ),
+        "risks": (
+            "forensic accounting exposure",
+            "auditor churn",
+            "related-party transactions",
+            "off-balance-sheet obligations",
+        ),
+    },
+}
+
+_ENRON_KEYWORDS = ("enron", "10-q", "auditor", "off-balance", "spe", "mark-to-market")
+# Whole words only ("spe" must not fire inside "perspective"), plurals and
+# possessives included ("auditors", "SPEs", "10-Qs", "auditor's").
+_ENRON_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, _ENRON_KEYWORDS)) + r")(?:s|'s)?\b", re.I)
+
+
+def _topic_is_enron(topic_text: str, context_text: str) -> bool:
+    return _ENRON_RE.search(topic_text + " " + context_text) is not None
+
+
+def _semanticize_items(is_enron: bool, items: List[str], stance: str, field: str) -> List[str]:
+    if not is_enron:
+        return items
+    pool = _ENRON_MAP.get(stance, {}).get(field, ())
+    out: List[str] = []
+    i = 0
+    for it in items:
+        if isinstance(it, str) and it.lstrip()[:7].lower() == "signal-":
+            out.append(pool[i % len(pool)] if pool else it)
+            i += 1
+        else:
+            out.append(it)
+    return out
+
+
+def _disjoint(top: List[str], others: List[str], fill_pool: Sequence[str], k: int) -> List[str]:
+    # Normalize each string once; compare on the normalized keys.
+    seen = {x.strip().lower() for x in top}
+    cleaned: List[str] = []
+    taken = set()
+    for x in others:
+        key = x.strip().lower()
+        if key not in seen:
+            cleaned.append(x)
+            taken.add(key)
+    for cand in fill_pool:
+        if len(cleaned) >= k:
+            break
+        key = cand.strip().lower()
+        if key not in seen and key not in taken:
+            cleaned.append(cand)
+            taken.add(key)
+    return cleaned[:k]
+
+
+# Parsed signals per (client id, system_preamble, topic, context), so agents
+# that repeat an input skip the LLM round-trip entirely.
+_SIGNAL_CACHE_SIZE = 256
+_signal_cache: OrderedDict[Tuple, Tuple[str, ...]] = _client_cache(OrderedDict())
+
+
+def _parse_signals(raw: str) -> List[str]:
+    # Very light parsing to retrieve up to 5 signals
+    parts = raw.split("Signals:")
+    if len(parts) < 2:
+        return ["signal-1", "signal-2", "signal-3", "signal-4", "signal-5"]
+    segment = parts[1].split(";")[0]
+    signals = [s.strip() for s in segment.split(",") if s.strip()]
+    if len(signals) < 5:
+        signals += [f"signal-{i}" for i in range(len(signals) + 1, 6)]
+    return signals[:5]
 
 
 class Agent:
+    # Deterministic path shapes by stance; shared and immutable, never copied per call.
+    _NEG_PATH: Tuple[float, ...] = (-3.0, -2.0, -1.0, -0.5, -0.2)
+    _POS_PATH: Tuple[float, ...] = (2.0, 1.5, 1.0, 0.5, 0.2)
+
     def __init__(self, config: AgentConfig, client: LLMClient) -> None:
         self.config = config
         self.client = client
 
-    def _extract_signals(self, topic: str, context: str) -> List[str]:
-        prompt = (
+    def build_prompt(self, topic: str, context: str) -> str:
+        return (
             f"{self.config.system_preamble}\n"
             f"Topic: {topic}\nContext: {context}\n"
             "Task: 1) Extract 5 signals. 2) Build 4-step chain. 3) Output thesis, drivers, risks, price path, confidence."
         )
-        raw = self.client.generate(prompt)
-        # Very light parsing to retrieve up to 5 signals
-        parts = raw.split("Signals:")
-        if len(parts) < 2:
-            return ["signal-1", "signal-2", "signal-3", "signal-4", "signal-5"]
-        segment = parts[1].split(";")[0]
-        signals = [s.strip() for s in segment.split(",") if s.strip()]
-        if len(signals) < 5:
-            signals += [f"signal-{i}" for i in range(len(signals) + 1, 6)]
-        return signals[:5]
-
-    def _price_path(self, stance: Stance) -> List[float]:
-        # Deterministic path shape by stance
-        if stance == "negative":
-            return [-3.0, -2.0, -1.0, -0.5, -0.2]
-        return [2.0, 1.5, 1.0, 0.5, 0.2]
-
-    def reason(self, topic: str, context: str, loop_style: str) -> Dict:
-        signals = self._extract_signals(topic, context)
+
+    def _signal_key(self, topic: str, context: str) -> Tuple | None:
+        """Signal-cache key, or None when the client opts out of caching."""
+        if not getattr(self.client, "cache", True):
+            return None
+        cid = _client_id(self.client)
+        return None if cid is None else (cid, self.config.system_preamble, topic, context)
+
+    def needs_response(self, topic: str, context: str) -> bool:
+        """False when signals for this input are already cached for this client."""
+        key = self._signal_key(topic, context)
+        return key is None or key not in _signal_cache
+
+    def _extract_signals(self, topic: str, context: str, response: str | None = None) -> List[str]:
+        key = self._signal_key(topic, context)
+        cached = _lru_get(_signal_cache, key) if key is not None else None
+        if cached is not None:
+            return list(cached)
+        raw = self.client.generate(self.build_prompt(topic, context)) if response is None else response
+        signals = _parse_signals(raw)
+        if key is not None:
+            _lru_put(_signal_cache, key, tuple(signals), _SIGNAL_CACHE_SIZE)
+        return signals
+
+    def _price_path(self, stance: Stance) -> Tuple[float, ...]:
+        return self._NEG_PATH if stance == "negative" else self._POS_PATH
+
+    def reason(self, topic: str, context: str, loop_style: str, response: str | None = None) -> Dict:
+        """Build this agent's outcome; pass ``response`` to reuse a pre-fetched completion."""
+        signals = self._extract_signals(topic, context, response)
         if self.config.stance == "negative":
             chain = negative_feedback_chain(signals, steps=4)
         else:
@@ -153,74 +405,13 @@ class Agent:
         for tag in ("NEG:", "POS:"):
             clean = clean[len(tag):].lstrip() if clean.startswith(tag) else clean
         # Stance-aware, topic-aware semanticization and overlap guard
-        _ENRON_MAP: Dict[str, Dict[str, List[str]]] = {
-            "negative": {
-                "drivers": [
-                    "auditor churn",
-                    "off-balance-sheet obligations",
-                    "related-party transactions",
-                    "mark-to-market opacity",
-                    "credit spread widening",
-                    "wholesale funding stress",
-                ],
-                "risks": [
-                    "regulatory intervention window",
-                    "short-squeeze reflex",
-                    "activist balance-sheet clean-up",
-                    "acquisition rumor",
-                ],
-            },
-            "positive": {
-                "drivers": [
-                    "short-squeeze reflex",
-                    "regulatory intervention window",
-                    "asset sale / deleveraging",
-                    "turnaround guidance",
-                    "credit line reaffirmation",
-                ],
-                "risks": [
-                    "forensic accounting exposure",
-                    "auditor churn",
-                    "related-party transactions",
-                    "off-balance-sheet obligations",
-                ],
-            },
-        }
-
-        def _topic_is_enron(topic_text: str, context_text: str) -> bool:
-            t = (topic_text + " " + context_text).lower()
-            return any(k in t for k in ["enron", "10-q", "auditor", "off-balance", "spe", "mark-to-market"])
-
-        def _semanticize_items(topic_text: str, context_text: str, items: List[str], stance: str, field: str) -> List[str]:
-            if not _topic_is_enron(topic_text, context_text):
-                return items
-            pool = _ENRON_MAP.get(stance, {}).get(field, [])
-            out: List[str] = []
-            i = 0
-            for it in items:
-                if isinstance(it, str) and it.strip().lower().startswith("signal-"):
-                    out.append(pool[i % len(pool)] if pool else it)
-                    i += 1
-                else:
-                    out.append(it)
-            return out
-
-        def _disjoint(top: List[str], others: List[str], fill_pool: List[str], k: int) -> List[str]:
-            seen = {x.strip().lower() for x in top}
-            cleaned = [x for x in others if x.strip().lower() not in seen]
-            for cand in fill_pool:
-                if len(cleaned) >= k:
-                    break
-                if cand.strip().lower() not in seen and cand not in cleaned:
-                    cleaned.append(cand)
-            return cleaned[:k]
-
+        is_enron = _topic_is_enron(topic, context)
         drv_raw = signals[:3]
         rsk_raw = signals[-3:]
-        drivers = _semanticize_items(topic, context, drv_raw, self.config.stance, "drivers")
-        risks = _semanticize_items(topic, context, rsk_raw, self.config.stance, "risks")
-        if _topic_is_enron(topic, context):
-            fill_pool = _ENRON_MAP.get(self.config.stance, {}).get("risks", [])
+        drivers = _semanticize_items(is_enron, drv_raw, self.config.stance, "drivers")
+        risks = _semanticize_items(is_enron, rsk_raw, self.config.stance, "risks")
+        if is_enron:
+            fill_pool = _ENRON_MAP.get(self.config.stance, {}).get("risks", ())
             risks = _disjoint(drivers, risks, fill_pool, k=3)
         price_path = self._price_path(self.config.stance)
         confidence = 0.65 if self.config.stance == "positive" else 0.6
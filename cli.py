@@ -9,6 +9,25 @@ from typing import Any
 from agents import MockClient, OpenAIClient
 from orchestrator import run_scenario
 
+# Optional fast JSON encoder; falls back to the stdlib encoder.
+try:  # pragma: no cover - optional
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional
+    orjson = None  # type: ignore
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _fmt_path(arr: list[float]) -> str:
+    """Format pct moves as '+1.2%, -0.5%'; values that round to zero print as +0.0%."""
+    s = ", ".join(f"{x:+.1f}%" for x in arr)
+    return s.replace("-0.0%", "+0.0%")
+
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Reflexivity loop agents")
@@ -30,19 +49,18 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--kappa", type=float, default=0.15, help="Decay for independent comparator paths.")
     parser.add_argument("--drift", type=float, default=0.2, help="Outward drift step for comparator paths.")
     parser.add_argument("--indep-mode", choices=("drift","decay"), default="drift", help="Comparator mode (outward drift or inward decay).")
+    parser.add_argument("--no-cache", action="store_true", help="Disable live response caching (samples at temperature 0.2).")
 
     args = parser.parse_args(argv)
 
-    client = (MockClient(seed=args.seed) if args.mock else OpenAIClient())
+    client = (MockClient(seed=args.seed) if args.mock else OpenAIClient(cache=not args.no_cache))
     result = run_scenario(topic=args.topic, context=args.context, client=client, weights=args.weights, damp=args.damp, eps=args.eps, neutral_style=args.neutral, horizon=args.horizon, unit=args.unit, path_mode=args.path_mode, kappa=args.kappa, indep_mode=args.indep_mode, drift=args.drift)
 
     if args.export:
-        import json as _json
         import pathlib as _pathlib
         _path = _pathlib.Path(args.export)
         _path.parent.mkdir(parents=True, exist_ok=True)
-        with open(_path, "w", encoding="utf-8") as f:
-            f.write(_json.dumps(result, ensure_ascii=False, indent=2))
+        _path.write_bytes(_dumps(result))
         print(f"Saved JSON → {args.export}")
 
     if args.csv:
@@ -57,34 +75,22 @@ def main(argv: list[str] | None = None) -> int:
         h = max(len(neg), len(neu), len(pos))
         neg_ind = result.get("comparators", {}).get("neg_independent", [None] * h)
         pos_ind = result.get("comparators", {}).get("pos_independent", [None] * h)
+        cols = (neg, neu, pos, neg_ind, pos_ind)
+        rows = [[i + 1] + [c[i] if i < len(c) else None for c in cols] for i in range(h)]
         with open(_p, "w", newline="", encoding="utf-8") as f:
-            w = _csv.DictWriter(f, fieldnames=["step", "NEG", "NEU", "POS", "NEG_INDEP", "POS_INDEP"]) 
-            w.writeheader()
-            for i in range(h):
-                w.writerow({
-                    "step": i + 1,
-                    "NEG": neg[i] if i < len(neg) else None,
-                    "NEU": neu[i] if i < len(neu) else None,
-                    "POS": pos[i] if i < len(pos) else None,
-                    "NEG_INDEP": neg_ind[i] if i < len(neg_ind) else None,
-                    "POS_INDEP": pos_ind[i] if i < len(pos_ind) else None,
-                })
+            w = _csv.writer(f)
+            w.writerow(["step", "NEG", "NEU", "POS", "NEG_INDEP", "POS_INDEP"])
+            w.writerows(rows)
         print(f"Saved CSV → {args.csv}")
 
     if args.as_json:
-        print(json.dumps(result, indent=2))
+        print(_dumps(result).decode("utf-8"))
         return 0
 
     # Pretty print minimal table-like output
-    def fmt_path(arr):
-        s = ", ".join([f"{(0.0 if abs(x) < 1e-9 else x):+.1f}%" for x in arr])
-        return s.replace("-0.0%", "+0.0%")
-
     def fmt_path_label(horizon: int, unit: str) -> str:
         return f"Price path ({horizon} {unit}):"
     outcomes = result["outcomes"]
-    def fmt_path(p: list[float]) -> str:
-        return ", ".join(f"{x:+.1f}%" for x in p)
 
     print(f"Topic: {result['topic']}")
     print(f"Context: {result['context']}")
@@ -98,7 +104,7 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Thesis: {out['thesis']}")
         print(f"Drivers: {_fmt_list(out['drivers'])}")
         print(f"Risks: {_fmt_list(out['risks'])}")
-        print(f"{fmt_path_label(len(out['price_path_week']), args.unit)} {fmt_path(out['price_path_week'])}")
+        print(f"{fmt_path_label(len(out['price_path_week']), args.unit)} {_fmt_path(out['price_path_week'])}")
         print(f"Confidence: {out.get('confidence', 0.5):.2f}")
 
     for tag in ("negative", "neutralized", "positive"):
@@ -106,8 +112,8 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.show_indep and "comparators" in result:
         print("\n[COMPARATORS]")
-        print(f"NEG (independent): {fmt_path(result['comparators']['neg_independent'])}")
-        print(f"POS (independent): {fmt_path(result['comparators']['pos_independent'])}")
+        print(f"NEG (independent): {_fmt_path(result['comparators']['neg_independent'])}")
+        print(f"POS (independent): {_fmt_path(result['comparators']['pos_independent'])}")
         print()
 
     return 0
@@ -4,9 +4,12 @@ Each function is deterministic and side-effect free.
 """
 
 import re
-from collections import OrderedDict
 from typing import List
 
+# Constant chain-step suffixes, appended after each "Step N: <signal>" head.
+_NEG_TAIL = " → investor flight → funding stress → liquidity spiral"
+_POS_TAIL = " → squeeze/relief rally → easier credit → perceived resilience"
+
 
 def negative_feedback_chain(signals: List[str], steps: int) -> List[str]:
     """Amplify adverse narratives into a compounding chain.
@@ -15,14 +18,8 @@ def negative_feedback_chain(signals: List[str], steps: int) -> List[str]:
     """
     if not signals:
         return []
-    steps = max(0, steps)
-    chain: List[str] = []
-    for i in range(steps):
-        signal = signals[i % len(signals)]
-        chain.append(
-            f"Step {i + 1}: {signal} → investor flight → funding stress → liquidity spiral"
-        )
-    return chain
+    n = len(signals)
+    return [f"Step {i + 1}: {signals[i % n]}{_NEG_TAIL}" for i in range(max(0, steps))]
 
 
 def positive_feedback_chain(signals: List[str], steps: int) -> List[str]:
@@ -32,20 +29,19 @@ def positive_feedback_chain(signals: List[str], steps: int) -> List[str]:
     """
     if not signals:
         return []
-    steps = max(0, steps)
-    chain: List[str] = []
-    for i in range(steps):
-        signal = signals[i % len(signals)]
-        chain.append(
-            f"Step {i + 1}: {signal} → squeeze/relief rally → easier credit → perceived resilience"
-        )
-    return chain
+    n = len(signals)
+    return [f"Step {i + 1}: {signals[i % n]}{_POS_TAIL}" for i in range(max(0, steps))]
+
+
+_WS = re.compile(r"\s+")
+_TAG = re.compile(r"^(NEG|POS)\s*:\s*", re.I)
+_SENT = re.compile(r"[.;!?]")
 
 
 def _first_clause(s: str, limit: int = 90) -> str:
-    s = re.sub(r"\s+", " ", (s or "").strip())
-    s = re.sub(r"^(NEG|POS)\s*:\s*", "", s, flags=re.I)
-    s = re.split(r"[.;!?]", s, maxsplit=1)[0]
+    s = _WS.sub(" ", (s or "").strip())
+    s = _TAG.sub("", s)
+    s = _SENT.split(s, maxsplit=1)[0]
     return (s[:limit] + "…") if len(s) > limit else s
 
 
@@ -70,7 +66,7 @@ def neutralization_bridge_compare(neg_summary: str, pos_summary: str) -> str:
 # Helpers
 def dedupe_keep_order(items: List[str]) -> List[str]:
     """De-duplicate while preserving first-seen order."""
-    return list(OrderedDict.fromkeys(i.strip() for i in items if i and i.strip()))
+    return list(dict.fromkeys(i.strip() for i in items if i and i.strip()))
 
 
 def blend_paths(
@@ -84,24 +80,15 @@ def blend_paths(
 ) -> List[float]:
     """
     Confidence-weighted blend, then dampen reflexivity clash.
-    All inputs are % moves (e.g., -3.0, +2.0).
+    All inputs are % moves (e.g., -3.0, +2.0). Moves within eps snap to 0;
+    adding 0.0 after rounding turns any -0.0 into 0.0.
     """
-    base = [(w_neg * n + w_pos * p) for n, p in zip(neg_path, pos_path)]
     if horizon and horizon > 5:
         step = max(0.35, min(0.9, damp * 5 / horizon))
     else:
         step = damp
-    return _clean_zero_list([x * step for x in base], eps=eps)
-
-
-def _clean_zero_list(vals: List[float], eps: float = 0.049) -> List[float]:
-    """Snap near-zeros to 0 and avoid -0.0 after rounding."""
-    out: List[float] = []
-    for v in vals:
-        v = 0.0 if abs(v) <= eps else v
-        v = 0.0 if v == 0 else v
-        out.append(round(v, 2))
-    return out
+    base = ((w_neg * n + w_pos * p) * step for n, p in zip(neg_path, pos_path))
+    return [round(v, 2) + 0.0 if abs(v) > eps else 0.0 for v in base]
 
 
 def geom_compound(seq: List[float]) -> List[float]:
@@ -109,7 +96,7 @@ def geom_compound(seq: List[float]) -> List[float]:
     acc = 1.0
     out: List[float] = []
     for p in seq:
-        acc *= (1.0 + p / 100.0)
+        acc *= 1.0 + p / 100.0
         out.append(round((acc - 1.0) * 100.0, 2))
     return out
 
@@ -119,33 +106,46 @@ def smooth_blend(seq: List[float], horizon: int) -> List[float]:
     if horizon <= 1 or not seq:
         return seq
     start, end = float(seq[0]), float(seq[-1])
-    return [round(start + (end - start) * i / (horizon - 1), 2) for i in range(horizon)]
+    last = horizon - 1
+    return [round(start + (end - start) * i / last, 2) for i in range(horizon)]
+
+
+def resample_path(path: List[float], points: int) -> List[float]:
+    """Linearly resample path onto `points` evenly spaced steps (unrounded)."""
+    n = len(path)
+    if points <= 0:
+        return path
+    if points == n:
+        return path[:]
+    if n == 1:
+        return [path[0]] * points
+    if points == 1:
+        return [path[0]]
+    last = points - 1
+    out: List[float] = []
+    for i in range(points):
+        posf = i * (n - 1) / last
+        j = int(posf)
+        t = posf - j
+        out.append(path[n - 1] if j >= n - 1 else path[j] * (1 - t) + path[j + 1] * t)
+    return out
 
 
 def independent_decay(start_step: float, horizon: int, kappa: float = 0.15) -> List[float]:
     """
     Non-reflexive path: per-step % move that decays geometrically toward 0 from the initial step.
-    Sign is preserved.
+    Sign is preserved. Closed form: start_step * (1 - kappa) ** i.
     """
-    out: List[float] = []
-    step = float(start_step)
-    for _ in range(horizon):
-        out.append(round(step, 2))
-        step *= (1.0 - kappa)
-    return out
+    start, ratio = float(start_step), 1.0 - float(kappa)
+    return [round(start * ratio ** i, 2) for i in range(horizon)]
 
 
 def independent_drift(start_step: float, horizon: int, drift: float = 0.2) -> List[float]:
     """
     Non-reflexive path: simple linear drift outward from the starting value.
     Positive starts get more positive, negatives more negative. Drift is pct increment per step.
+    Closed form: start_step + sign * drift * i.
     """
-    out: List[float] = []
-    step = float(start_step)
-    sign = 1.0 if step >= 0 else -1.0
-    for _ in range(horizon):
-        out.append(round(step, 2))
-        step += sign * float(drift)
-    return out
-
-
+    start = float(start_step)
+    delta = (1.0 if start >= 0 else -1.0) * float(drift)
+    return [round(start + delta * i, 2) for i in range(horizon)]
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List
+import json
+import os
+from typing import Dict, List, Tuple
 
-from agents import Agent, AgentConfig, LLMClient
+from agents import Agent, AgentConfig, LLMClient, _client_cache, _client_id, _lru_get, _lru_put
 from loops import (
     neutralization_bridge,
     neutralization_bridge_compare,
@@ -15,8 +19,14 @@ from loops import (
     smooth_blend,
     independent_decay,
     independent_drift,
+    resample_path,
 )
 
+try:  # pragma: no cover - optional
+    import numpy as _np  # type: ignore
+except Exception:  # pragma: no cover - optional
+    _np = None  # type: ignore
+
 SCHEMA = {
     "type": "object",
     "required": ["topic", "context", "outcomes"],
@@ -28,6 +38,65 @@ SCHEMA = {
     },
 }
 
+# Optional schema guardrail, compiled once.
+try:  # pragma: no cover - optional
+    from jsonschema import Draft7Validator  # type: ignore
+
+    _VALIDATOR = Draft7Validator(SCHEMA)
+except ImportError:  # pragma: no cover - optional
+    _VALIDATOR = None
+
+# Agent configs are frozen and shared by every run.
+NEG_CFG = AgentConfig(
+    name="NEG",
+    stance="negative",
+    system_preamble=(
+        "You are the NEGATIVE feedback agent. Amplify adverse narratives: fraud contagion, "
+        "liquidity spirals, covenant breaches, regulatory overhang. Build a self-reinforcing "
+        "causal chain. Be precise and non-defamatory; flag uncertainty."
+    ),
+)
+
+POS_CFG = AgentConfig(
+    name="POS",
+    stance="positive",
+    system_preamble=(
+        "You are the POSITIVE feedback agent. Amplify constructive narratives: flight-to-quality "
+        "illusions, short-squeezes, turnaround catalysts, accounting clean-up. Build a self-"
+        "reinforcing causal chain. Be precise and non-defamatory; flag uncertainty."
+    ),
+)
+
+
+_UTC = timezone.utc
+
+
+def _now_iso() -> str:
+    """UTC timestamp for result meta; patch to a constant in benchmarks."""
+    return datetime.now(_UTC).isoformat()
+
+
+def _agent_workers() -> int:
+    """Concurrency for agent calls; LOOP_AGENTS_WORKERS=1 forces serial runs for any client."""
+    try:
+        return int(os.getenv("LOOP_AGENTS_WORKERS", "2"))
+    except ValueError:
+        return 2
+
+
+def _fixed_path(src: List[float], n: int = 5) -> List[float]:
+    """First n values of src as floats, zero-padded, in one preallocated list."""
+    out = [0.0] * n
+    k = min(len(src), n)
+    out[:k] = [float(x) for x in src[:k]]
+    return out
+
+
+# Finished results keyed by (client id, topic, context, params), stored as JSON
+# so every hit hands back an independent copy.
+_RESULT_CACHE_SIZE = 128
+_result_cache: OrderedDict[Tuple, str] = _client_cache(OrderedDict())
+
 
 def run_scenario(
     topic: str,
@@ -43,35 +112,84 @@ def run_scenario(
     kappa: float | None = None,
     indep_mode: str | None = None,
     drift: float | None = None,
+    cache: bool | None = None,
 ) -> Dict:
-    neg_cfg = AgentConfig(
-        name="NEG",
-        stance="negative",
-        system_preamble=(
-            "You are the NEGATIVE feedback agent. Amplify adverse narratives: fraud contagion, "
-            "liquidity spirals, covenant breaches, regulatory overhang. Build a self-reinforcing "
-            "causal chain. Be precise and non-defamatory; flag uncertainty."
-        ),
-    )
-    pos_cfg = AgentConfig(
-        name="POS",
-        stance="positive",
-        system_preamble=(
-            "You are the POSITIVE feedback agent. Amplify constructive narratives: flight-to-quality "
-            "illusions, short-squeezes, turnaround catalysts, accounting clean-up. Build a self-"
-            "reinforcing causal chain. Be precise and non-defamatory; flag uncertainty."
-        ),
+    """Run NEG/POS agents and combine them into three outcomes.
+
+    Repeat calls with the same client and arguments are served from an
+    in-process cache unless ``cache`` is False. By default this follows the
+    client's own ``cache`` setting (OpenAIClient(cache=False) disables it).
+    """
+    params = dict(
+        weights=weights, damp=damp, eps=eps, neutral_style=neutral_style, horizon=horizon,
+        unit=unit, path_mode=path_mode, kappa=kappa, indep_mode=indep_mode, drift=drift,
     )
+    use_cache = getattr(client, "cache", True) if cache is None else cache
+    cid = _client_id(client) if use_cache else None
+    if cid is None:
+        return _run_scenario(topic, context, client, **params)
+
+    key = (cid, topic, context, tuple(params.items()))
+    hit = _lru_get(_result_cache, key)
+    if hit is not None:
+        result = json.loads(hit)
+        result["meta"]["timestamp"] = _now_iso()
+        return result
+    result = _run_scenario(topic, context, client, **params)
+    _lru_put(_result_cache, key, json.dumps(result), _RESULT_CACHE_SIZE)
+    return result
+
 
-    neg_agent = Agent(neg_cfg, client)
-    pos_agent = Agent(pos_cfg, client)
+def _run_scenario(
+    topic: str,
+    context: str,
+    client: LLMClient,
+    weights: str | None = None,
+    damp: float | None = None,
+    eps: float | None = None,
+    neutral_style: str | None = None,
+    horizon: int | None = None,
+    unit: str | None = None,
+    path_mode: str | None = None,
+    kappa: float | None = None,
+    indep_mode: str | None = None,
+    drift: float | None = None,
+) -> Dict:
+    neg_agent = Agent(NEG_CFG, client)
+    pos_agent = Agent(POS_CFG, client)
+
+    # Clients that can batch get the uncached prompts in one concurrent dispatch;
+    # plain clients have the two (I/O-bound) agents run on separate threads.
+    # With a single worker both agents call generate() one after the other.
+    pair = (neg_agent, pos_agent)
+    responses: List[str | None] = [None, None]
+    workers = _agent_workers()
+    generate_many = getattr(client, "generate_many", None)
+    if workers > 1 and callable(generate_many):
+        todo = [i for i, a in enumerate(pair) if a.needs_response(topic, context)]
+        if todo:
+            fetched = generate_many([pair[i].build_prompt(topic, context) for i in todo])
+            for i, raw in zip(todo, fetched):
+                responses[i] = raw
+    if workers > 1 and not callable(generate_many):
+        with ThreadPoolExecutor(max_workers=min(workers, len(pair))) as pool:
+            neg_fut = pool.submit(neg_agent.reason, topic, context, "amplify")
+            pos_fut = pool.submit(pos_agent.reason, topic, context, "amplify")
+            neg, pos = neg_fut.result(), pos_fut.result()
+    else:
+        neg = neg_agent.reason(topic, context, loop_style="amplify", response=responses[0])
+        pos = pos_agent.reason(topic, context, loop_style="amplify", response=responses[1])
 
-    neg = neg_agent.reason(topic, context, loop_style="amplify")
-    pos = pos_agent.reason(topic, context, loop_style="amplify")
+    # Bind the agent fields once; everything below reads these locals.
+    neg_thesis, pos_thesis = neg.get("thesis", ""), pos.get("thesis", "")
+    # Capped at 3 once; the outcomes keep this agent order, the mix reorders.
+    neg_drivers, pos_drivers = (neg.get("drivers", []) or [])[:3], (pos.get("drivers", []) or [])[:3]
+    neg_risks, pos_risks = (neg.get("risks", []) or [])[:3], (pos.get("risks", []) or [])[:3]
+    neg_conf, pos_conf = float(neg.get("confidence", 0.5)), float(pos.get("confidence", 0.5))
 
     # Confidence weights (normalized)
-    c_neg = max(0.0, min(1.0, float(neg.get("confidence", 0.5))))
-    c_pos = max(0.0, min(1.0, float(pos.get("confidence", 0.5))))
+    c_neg = max(0.0, min(1.0, neg_conf))
+    c_pos = max(0.0, min(1.0, pos_conf))
     total = (c_neg + c_pos) or 1.0
     w_neg, w_pos = c_neg / total, c_pos / total
     if weights:
@@ -84,101 +202,95 @@ def run_scenario(
 
     # Thesis via bridge
     if (neutral_style or "concise").lower().startswith("compare"):
-        neutral_thesis = neutralization_bridge_compare(neg.get("thesis", ""), pos.get("thesis", ""))
+        neutral_thesis = neutralization_bridge_compare(neg_thesis, pos_thesis)
     else:
-        neutral_thesis = neutralization_bridge(neg.get("thesis", ""), pos.get("thesis", ""))
+        neutral_thesis = neutralization_bridge(neg_thesis, pos_thesis)
 
     # Drivers/risks: prefer substance, then mix 2 from NEG + 2 from POS, cap to 3
     def _prefer_substance(items: List[str]) -> List[str]:
-        return sorted(items, key=lambda x: str(x).lower().startswith("signal-"))
+        # Stable partition: substance first, "signal-*" placeholders last.
+        tagged = [(str(x)[:7].lower() == "signal-", x) for x in items]
+        return [x for is_sig, x in tagged if not is_sig] + [x for is_sig, x in tagged if is_sig]
 
     def _mix(a: List[str], b: List[str], k: int = 3) -> List[str]:
+        seen = set()
         out: List[str] = []
         for x in (a + b):
-            if x not in out:
+            if x not in seen:
+                seen.add(x)
                 out.append(x)
             if len(out) == k:
                 break
         return out
 
-    neg_drv = _prefer_substance(neg.get("drivers", [])[:3])
-    pos_drv = _prefer_substance(pos.get("drivers", [])[:3])
+    neg_drv = _prefer_substance(neg_drivers)
+    pos_drv = _prefer_substance(pos_drivers)
     drivers_neu = dedupe_keep_order(_mix(neg_drv[:2], pos_drv[:2], k=3))
 
-    neg_rsk = _prefer_substance(neg.get("risks", [])[:3])
-    pos_rsk = _prefer_substance(pos.get("risks", [])[:3])
+    neg_rsk = _prefer_substance(neg_risks)
+    pos_rsk = _prefer_substance(pos_risks)
     risks_neu = dedupe_keep_order(_mix(neg_rsk[:2], pos_rsk[:2], k=3))
-    # prevent overlap & ensure fallback
-    risks_neu = [r for r in risks_neu if r not in drivers_neu][:3]
-    if not risks_neu:
-        risks_neu = ["governance uncertainty", "liquidity squeeze", "model uncertainty"]
 
     # Numeric paths: ensure lists of 5 floats
-    neg_path = [float(x) for x in neg.get("price_path_week", [])][:5]
-    pos_path = [float(x) for x in pos.get("price_path_week", [])][:5]
-    while len(neg_path) < 5:
-        neg_path.append(0.0)
-    while len(pos_path) < 5:
-        pos_path.append(0.0)
+    neg_path = _fixed_path(neg.get("price_path_week", []) or [])
+    pos_path = _fixed_path(pos.get("price_path_week", []) or [])
 
     # Optional horizon resampling
-    def _resample_path(path: List[float], points: int) -> List[float]:
-        n = len(path)
-        if points <= 0:
-            return path
-        if points == n:
-            return path[:]
-        if n == 1:
-            return [path[0]] * points
-        # Linear interpolation from indices [0..n-1] to points
-        out: List[float] = []
-        for i in range(points):
-            posf = i * (n - 1) / (points - 1)
-            j = int(posf)
-            t = posf - j
-            if j >= n - 1:
-                out.append(path[-1])
-            else:
-                out.append(path[j] * (1 - t) + path[j + 1] * t)
-        return out
-
     if isinstance(horizon, int) and horizon > 0 and horizon != 5:
-        neg_path = _resample_path(neg_path, horizon)
-        pos_path = _resample_path(pos_path, horizon)
+        neg_path = resample_path(neg_path, horizon)
+        pos_path = resample_path(pos_path, horizon)
     damp_factor = damp if isinstance(damp, float) else 0.55
     eps_value = eps if isinstance(eps, float) else 0.049
     h = max(len(neg_path), len(pos_path))
-    blended = blend_paths(neg_path, pos_path, w_neg, w_pos, damp=damp_factor, eps=eps_value, horizon=h)
-    if (path_mode or "linear").lower().startswith("geom"):
+    geom = (path_mode or "linear").lower().startswith("geom")
+    if geom or h <= 1:
+        blended = blend_paths(neg_path, pos_path, w_neg, w_pos, damp=damp_factor, eps=eps_value, horizon=h)
+    else:
+        # Linear smoothing only reads the blended endpoints, so blend just those.
+        blended = blend_paths(
+            [neg_path[0], neg_path[-1]], [pos_path[0], pos_path[-1]],
+            w_neg, w_pos, damp=damp_factor, eps=eps_value, horizon=h,
+        )
+    if geom:
         blended = geom_compound(blended)
     blended = smooth_blend(blended, horizon=h)
 
     def _pad3(xs: List[str], pool: List[str]) -> List[str]:
         xs = xs[:3]
+        have = set(xs)
         for c in pool:
             if len(xs) == 3:
                 break
-            if c not in xs:
+            if c not in have:
+                have.add(c)
                 xs.append(c)
         return xs
 
     drivers_neu = _pad3(drivers_neu, ["dampened feedback"])
-    risks_neu = _pad3(risks_neu, ["liquidity squeeze", "governance uncertainty", "model uncertainty"])
+    # Prevent (case-insensitive) overlap & ensure fallback, once the drivers are final
+    drivers_lc = frozenset(s.lower() for s in drivers_neu)
+    risks_neu = [r for r in risks_neu if r.lower() not in drivers_lc][:3] or [
+        r for r in ("governance uncertainty", "liquidity squeeze", "model uncertainty") if r not in drivers_lc
+    ]
+    risks_neu = _pad3(
+        risks_neu,
+        [r for r in ("liquidity squeeze", "governance uncertainty", "model uncertainty") if r not in drivers_lc],
+    )
 
     outcomes = {
         "negative": {
-            "thesis": neg["thesis"],
-            "drivers": neg["drivers"][:3],
-            "risks": neg["risks"][:3],
+            "thesis": neg_thesis,
+            "drivers": neg_drivers,
+            "risks": neg_risks,
             "price_path_week": neg_path,
-            "confidence": float(neg["confidence"]),
+            "confidence": neg_conf,
         },
         "positive": {
-            "thesis": pos["thesis"],
-            "drivers": pos["drivers"][:3],
-            "risks": pos["risks"][:3],
+            "thesis": pos_thesis,
+            "drivers": pos_drivers,
+            "risks": pos_risks,
             "price_path_week": pos_path,
-            "confidence": float(pos["confidence"]),
+            "confidence": pos_conf,
         },
         "neutralized": {
             "thesis": neutral_thesis,
@@ -189,27 +301,6 @@ def run_scenario(
         },
     }
 
-    # Variance band based on spread between POS and NEG
-    try:
-        import numpy as _np  # type: ignore
-
-        neg_arr = _np.array(neg_path, dtype=float)
-        pos_arr = _np.array(pos_path, dtype=float)
-        spread = _np.abs(pos_arr - neg_arr)
-        band = float(spread.mean() / 4.0)
-        outcomes["neutralized"]["band"] = {
-            "upper": [round(x + band, 2) for x in blended],
-            "lower": [round(x - band, 2) for x in blended],
-        }
-    except Exception:
-        pass
-
-    # Ensure neutral risks have fallback and no overlap
-    risks_neu = [r for r in outcomes["neutralized"]["risks"] if r not in outcomes["neutralized"]["drivers"]][:3]
-    if not risks_neu:
-        risks_neu = ["governance uncertainty", "liquidity squeeze", "model uncertainty"]
-    outcomes["neutralized"]["risks"] = risks_neu
-
     mode = "mock" if client.__class__.__name__ == "MockClient" else "live"
     result = {
         "topic": topic,
@@ -217,7 +308,7 @@ def run_scenario(
         "outcomes": outcomes,
         "meta": {
             "mode": mode,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
         },
     }
 
@@ -245,35 +336,36 @@ def run_scenario(
         pos_indep = independent_drift(
             start_step=(pos_path[0] if pos_path else 1.0), horizon=h, drift=d
         )
-    if (path_mode or "linear").lower().startswith("geom"):
+    if geom:
         neg_indep = geom_compound(neg_indep)
         pos_indep = geom_compound(pos_indep)
     result.setdefault("comparators", {})["neg_independent"] = neg_indep
     result["comparators"]["pos_independent"] = pos_indep
 
-    # Delta metric: area between coupled vs independent curves
-    try:
-        import numpy as _np  # type: ignore
-
-        neu_arr = _np.array(outcomes["neutralized"]["price_path_week"], dtype=float)
-        neg_arr = _np.array(neg_path, dtype=float)
-        pos_arr = _np.array(pos_path, dtype=float)
-        neg_ind = _np.array(neg_indep, dtype=float)
-        pos_ind = _np.array(pos_indep, dtype=float)
-        area_neg = float(_np.abs(neg_arr - neg_ind).sum())
-        area_pos = float(_np.abs(pos_arr - pos_ind).sum())
+    # Variance band (from the POS/NEG spread) and interaction area (coupled vs
+    # independent curves), computed in one pass over arrays built once.
+    if _np is not None:
+        neg_arr = _np.asarray(neg_path, dtype=_np.float64)
+        pos_arr = _np.asarray(pos_path, dtype=_np.float64)
+        neu_arr = _np.asarray(blended, dtype=_np.float64)
+        band = float(_np.abs(pos_arr - neg_arr).mean() / 4.0)
+        outcomes["neutralized"]["band"] = {
+            # Builtin round() on Python floats, to match the rest of the JSON output.
+            "upper": [round(v, 2) for v in (neu_arr + band).tolist()],
+            "lower": [round(v, 2) for v in (neu_arr - band).tolist()],
+        }
+        dev = _np.abs(_np.stack((neg_arr, pos_arr)) - _np.asarray((neg_indep, pos_indep), dtype=_np.float64))
+        area_neg, area_pos = dev.sum(axis=1).tolist()
         result.setdefault("meta", {})["interaction_area"] = {
             "neg": round(area_neg, 2),
             "pos": round(area_pos, 2),
         }
-    except Exception:
-        pass
 
-    try:
-        import jsonschema  # type: ignore
-        jsonschema.validate(instance=result, schema=SCHEMA)  # type: ignore
-    except Exception as e:  # pragma: no cover - optional guardrail
-        result.setdefault("meta", {})["validation_error"] = str(e)
+    if _VALIDATOR is not None:
+        try:
+            _VALIDATOR.validate(result)
+        except Exception as e:  # pragma: no cover - optional guardrail
+            result.setdefault("meta", {})["validation_error"] = str(e)
 
     return result
 
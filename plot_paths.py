@@ -1,10 +1,9 @@
 # plot_paths.py
 import argparse
-import csv
 import json
 import os
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 
 
 def parse_args():
@@ -16,39 +15,43 @@ def parse_args():
     return p.parse_args()
 
 
-def get_first(row, keys):
+def get_column(data, keys, required=True):
+    """Return the first present column as a float array (blank cells are NaN)."""
+    names = data.dtype.names or ()
     for k in keys:
-        if k in row:
-            return row[k]
-    raise KeyError(keys[0])
+        if k in names:
+            return np.atleast_1d(np.asarray(data[k], dtype=float))
+    if required:
+        raise KeyError(keys[0])
+    return np.array([], dtype=float)
 
 
 def main():
     args = parse_args()
+    # Saving needs no GUI: pick the non-interactive backend before pyplot loads.
+    if args.save:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
 
-    neg, neu, pos = [], [], []
-    neg_ind, pos_ind = [], []
-    with open(args.csv, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            neg.append(float(get_first(row, ["NEG", "negative"])) if get_first(row, ["NEG", "negative"]) not in (None, "") else np.nan)
-            neu.append(float(get_first(row, ["NEU", "neutralized"])) if get_first(row, ["NEU", "neutralized"]) not in (None, "") else np.nan)
-            pos.append(float(get_first(row, ["POS", "positive"])) if get_first(row, ["POS", "positive"]) not in (None, "") else np.nan)
-            # Optional comparators
-            v_neg_i = row.get("NEG_INDEP") or row.get("neg_independent")
-            v_pos_i = row.get("POS_INDEP") or row.get("pos_independent")
-            if v_neg_i not in (None, ""):
-                neg_ind.append(float(v_neg_i))
-            if v_pos_i not in (None, ""):
-                pos_ind.append(float(v_pos_i))
+    # Parse the whole CSV in one pass; columns come back as float arrays.
+    data = np.genfromtxt(args.csv, delimiter=",", names=True, dtype=float, encoding="utf-8")
+    neg = get_column(data, ["NEG", "negative"])
+    neu = get_column(data, ["NEU", "neutralized"])
+    pos = get_column(data, ["POS", "positive"])
+    # Optional comparators
+    neg_ind = get_column(data, ["NEG_INDEP", "neg_independent"], required=False)
+    pos_ind = get_column(data, ["POS_INDEP", "pos_independent"], required=False)
+    neg_ind = neg_ind[~np.isnan(neg_ind)]
+    pos_ind = pos_ind[~np.isnan(pos_ind)]
 
     x = np.arange(1, len(neu) + 1)
 
     # Band from POS-NEG spread (same heuristic as orchestrator)
-    spread = np.abs(np.array(pos) - np.array(neg))
+    spread = np.abs(pos - neg)
     band_w = float(np.nanmean(spread) / 4.0)
-    upper = [round(v + band_w, 2) for v in neu]
-    lower = [round(v - band_w, 2) for v in neu]
+    # Builtin round() on Python floats, matching the orchestrator's exported band.
+    upper = [round(v, 2) for v in (neu + band_w).tolist()]
+    lower = [round(v, 2) for v in (neu - band_w).tolist()]
 
     unit = "days"
     try:
@@ -63,9 +66,9 @@ def main():
     plt.plot(x, neg, label="NEG", color="#d62728", lw=2)
     plt.plot(x, neu, label="NEU", color="#1f77b4", lw=2)
     plt.plot(x, pos, label="POS", color="#2ca02c", lw=2)
-    plt.fill_between(x, lower, upper, color="#1f77b4", alpha=0.15, label="NEU band")
+    plt.fill_between(x, lower, upper, color="#1f77b4", alpha=0.15, label="NEU band", rasterized=True)
 
-    if args.show_indep and neg_ind and pos_ind:
+    if args.show_indep and len(neg_ind) and len(pos_ind):
         xi = np.arange(1, max(len(neg_ind), len(pos_ind)) + 1)
         plt.plot(xi, neg_ind, label="NEG (indep)", color="#d62728", lw=1.5, ls=":")
         plt.plot(xi, pos_ind, label="POS (indep)", color="#2ca02c", lw=1.5, ls=":")
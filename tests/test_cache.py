@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import gc
+import threading
+from types import SimpleNamespace
+import weakref
+
+import agents
+from agents import Agent, MockClient, OpenAIClient
+from orchestrator import NEG_CFG, run_scenario
+
+
+class _FakeCompletions:
+    def __init__(self) -> None:
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            message = SimpleNamespace(content=f"reply {len(self.calls)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class _CountingClient(MockClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.prompts = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return super().generate(prompt)
+
+
+@dataclass
+class _DataClient:
+    """Unhashable (eq=True dataclass) generate()-only client."""
+
+    calls: int = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return MockClient().generate(prompt)
+
+
+def _live_client(cache: bool = True):
+    client = OpenAIClient(cache=cache)
+    client.api_key = "test-key"
+    completions = _FakeCompletions()
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client, completions
+
+
+def test_live_cache_reuses_response():
+    agents._response_cache.clear()
+    client, completions = _live_client()
+    assert client.generate("same prompt") == client.generate("same prompt")
+    assert len(completions.calls) == 1
+    assert completions.calls[0]["temperature"] == 0.0
+
+
+def test_live_cache_disabled():
+    agents._response_cache.clear()
+    client, completions = _live_client(cache=False)
+    assert client.generate("same prompt") != client.generate("same prompt")
+    assert len(completions.calls) == 2
+
+
+def test_generate_many_keeps_order_and_uses_cache():
+    agents._response_cache.clear()
+    client, completions = _live_client()
+    cached = client.generate("b")
+    out = client.generate_many(["a", "b", "c"])
+    assert out[1] == cached
+    assert sorted(out[0::2]) == ["reply 2", "reply 3"]
+    assert sorted(c["messages"][-1]["content"] for c in completions.calls[1:]) == ["a", "c"]
+    assert client.generate_many(["a", "b", "c"]) == out
+
+
+def test_generate_many_inside_event_loop():
+    agents._response_cache.clear()
+    client, completions = _live_client()
+
+    async def main():
+        return client.generate_many(["x", "y"])
+
+    assert len(asyncio.run(main())) == 2
+    assert len(completions.calls) == 2
+
+
+def test_signals_cached_per_client():
+    client = _CountingClient()
+    # Bypass the result cache so the second run reaches the agents again.
+    first = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", client, cache=False)
+    second = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", client, cache=False)
+    assert len(client.prompts) == 2
+    assert first["outcomes"] == second["outcomes"]
+
+
+def test_signal_cache_respects_client_opt_out():
+    client = _CountingClient()
+    client.cache = False
+    run_scenario("Enron-like patterns", "Company X 10-Q anomalies", client)
+    run_scenario("Enron-like patterns", "Company X 10-Q anomalies", client)
+    assert len(client.prompts) == 4
+
+
+def test_signal_cache_accepts_unhashable_clients_without_keeping_them():
+    client = _DataClient()
+    agent = Agent(NEG_CFG, client)
+    first = agent.reason("Enron-like patterns", "Company X 10-Q anomalies", "amplify")
+    assert agent.reason("Enron-like patterns", "Company X 10-Q anomalies", "amplify") == first
+    assert client.calls == 1
+    ref = weakref.ref(client)
+    del agent, client
+    gc.collect()
+    assert ref() is None
+
+
+def test_scenario_accepts_unhashable_clients_without_keeping_them():
+    client = _DataClient()
+    first = run_scenario("Bank run risk", "Regional lender deposit flight", client)
+    second = run_scenario("Bank run risk", "Regional lender deposit flight", client)
+    assert first["outcomes"] == second["outcomes"]
+    assert client.calls == 2
+    ref = weakref.ref(client)
+    del client
+    gc.collect()
+    assert ref() is None
+
+
+def test_scenario_result_cache_returns_copies():
+    client = _CountingClient()
+    first = run_scenario("Bank run risk", "Regional lender deposit flight", client, horizon=7)
+    first["outcomes"]["negative"]["drivers"].append("mutated")
+    second = run_scenario("Bank run risk", "Regional lender deposit flight", client, horizon=7)
+    assert "mutated" not in second["outcomes"]["negative"]["drivers"]
+    assert len(client.prompts) == 2
+    uncached = run_scenario("Bank run risk", "Regional lender deposit flight", client, horizon=7, cache=False)
+    assert uncached["outcomes"] == second["outcomes"]
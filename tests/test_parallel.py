@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+from agents import MockClient
+from orchestrator import run_scenario
+
+
+class _PlainClient:
+    """generate()-only client, so run_scenario takes the threaded path."""
+
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        self._mock = MockClient()
+        self._barrier = barrier
+
+    def generate(self, prompt: str) -> str:
+        if self._barrier is not None:
+            # Both agent calls must be in flight at once, or this times out.
+            self._barrier.wait()
+        return self._mock.generate(prompt)
+
+
+class _BatchingClient(_PlainClient):
+    def generate_many(self, prompts):
+        raise AssertionError("LOOP_AGENTS_WORKERS=1 must not batch")
+
+
+def test_threaded_agents_match_serial(monkeypatch):
+    monkeypatch.delenv("LOOP_AGENTS_WORKERS", raising=False)
+    barrier = threading.Barrier(2, timeout=5)
+    threaded = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", _PlainClient(barrier))
+    assert not barrier.broken
+    batched = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", MockClient())
+    monkeypatch.setenv("LOOP_AGENTS_WORKERS", "1")
+    serial = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", _PlainClient())
+    assert threaded["outcomes"] == serial["outcomes"] == batched["outcomes"]
+
+
+def test_single_worker_skips_batching(monkeypatch):
+    monkeypatch.setenv("LOOP_AGENTS_WORKERS", "1")
+    res = run_scenario("Enron-like patterns", "Company X 10-Q anomalies", _BatchingClient())
+    assert res["outcomes"]["negative"]["drivers"]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from agents import _topic_is_enron
+
+
+def test_enron_keywords_match_plurals_and_possessives():
+    assert _topic_is_enron("Audit risk", "auditors resigned; special purpose")
+    assert _topic_is_enron("Vehicles", "three SPEs consolidated")
+    assert _topic_is_enron("Filings", "late 10-Qs")
+    assert _topic_is_enron("Audit", "the auditor's letter")
+    assert _topic_is_enron("Enron-like patterns", "")
+
+
+def test_enron_keywords_need_word_boundaries():
+    assert not _topic_is_enron("Market perspective", "special dividend; speculative spend")